@@ -2,18 +2,28 @@
 Main Streamlit application for the LLM RAG API Documentation Assistant
 """
 import streamlit as st
+import bisect
+import hashlib
 import os
+import re
 import sys
-from typing import List, Dict
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import List, Dict, Tuple
+
+import numpy as np
 
 # Add src directory to path
 sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
 
 from src.config import Config
 from src.document_processor import DocumentProcessor
-from src.vector_store import VectorStore
 from src.rag_pipeline import RAGPipeline
 from src.professional_doc_generator import ProfessionalDocumentationGenerator
+from src.semantic_cache import SemanticCache
+from src.cached_encoder import CachedEncoder
+from src.embedding_cache import EmbeddingCache
+from src.sqlite_vec_store import create_vector_store
 
 # Page configuration
 st.set_page_config(
@@ -34,13 +44,151 @@ if 'professional_doc_generator' not in st.session_state:
     st.session_state.professional_doc_generator = None
 if 'generated_documentation' not in st.session_state:
     st.session_state.generated_documentation = []
+if 'query_result_cache' not in st.session_state:
+    st.session_state.query_result_cache = OrderedDict()
+if 'query_cache_generation' not in st.session_state:
+    st.session_state.query_cache_generation = None
+if 'semantic_cache' not in st.session_state:
+    st.session_state.semantic_cache = None
+
+# Maximum number of cached query embeddings / answers
+QUERY_CACHE_SIZE = 512
+# Cosine similarity above which a previous answer is reused
+SEMANTIC_CACHE_THRESHOLD = 0.92
+SEMANTIC_CACHE_SIZE = 1024
+# Upper bound on files parsed concurrently
+MAX_PARSE_WORKERS = 8
+# Confidence thresholds (exclusive) and the colour shown in each band
+CONFIDENCE_THRESHOLDS = [0.4, 0.7]
+CONFIDENCE_COLORS = ["red", "orange", "green"]
+# Chat turns shown by default; older ones go in an expander
+HISTORY_RECENT_TURNS = 20
+# Generated documents kept in the process-wide memo
+DOC_CACHE_ENTRIES = 64
+# Extensions that are always treated as source code
+CODE_FILE_EXTENSIONS = frozenset({'.py', '.js', '.java', '.cpp', '.c', '.go', '.rs', '.php', '.ts'})
+
+@st.cache_data
+def get_config():
+    """Parse the environment configuration once"""
+    return Config()
+
+@st.cache_resource
+def get_processor():
+    """Shared document processor (tokenizer loaded once per process)"""
+    return DocumentProcessor()
+
+@st.cache_resource
+def get_vector_store():
+    """Shared vector store (one client per process)"""
+    store = create_vector_store()
+    # Query lookups share the store's model, so each query is embedded once
+    store.embedding_model = CachedEncoder(store.embedding_model, maxsize=QUERY_CACHE_SIZE)
+    return store
+
+@st.cache_resource
+def get_rag_pipeline():
+    """Shared RAG pipeline, kept across reruns; searches the shared vector store"""
+    # RAGPipeline() still opens its own store in __init__; it is replaced
+    # here and never used
+    pipeline = RAGPipeline()
+    pipeline.vector_store = get_vector_store()
+    return pipeline
+
+@st.cache_resource
+def get_pro_doc_generator():
+    """Shared professional documentation generator"""
+    return ProfessionalDocumentationGenerator()
+
+@st.cache_resource
+def get_embedding_cache():
+    """Persistent record of chunk texts already embedded, next to the Chroma data"""
+    return EmbeddingCache(os.path.join(get_config().CHROMA_PERSIST_DIRECTORY, 'embedding_cache.sqlite3'))
+
+@st.cache_resource
+def get_knowledge_base_generation() -> Dict:
+    """Process-wide counter bumped whenever the shared knowledge base changes"""
+    return {'value': 0}
+
+def embedding_cache_namespace() -> str:
+    """Key chunk-dedup entries by back-end as well as model, so switching
+    VECTOR_BACKEND (or falling back to Chroma) never skips chunks the
+    active store does not hold"""
+    return f"{type(get_vector_store()).__name__}:{get_config().EMBEDDING_MODEL}"
+
+def normalize_query(text: str) -> str:
+    """Normalize a query so trivially different phrasings share a cache entry"""
+    return re.sub(r'\s+', ' ', text.strip().lower())
+
+def query_cache_key(text_norm: str) -> str:
+    """Stable cache key for a normalized query"""
+    return hashlib.sha256(text_norm.encode('utf-8')).hexdigest()
+
+def get_query_embedder() -> CachedEncoder:
+    """Query encoder shared with the vector store; its cache also serves the
+    embedding done inside process_query"""
+    return get_vector_store().embedding_model
+
+def embed_query(query: str) -> np.ndarray:
+    """Embed a query, reusing the cached vector for repeated questions"""
+    return get_query_embedder().encode(query)
+
+def sync_query_caches():
+    """Drop this session's cached answers if any session changed the knowledge base"""
+    generation = get_knowledge_base_generation()['value']
+    if st.session_state.query_cache_generation != generation:
+        st.session_state.query_result_cache = OrderedDict()
+        st.session_state.semantic_cache = None
+        st.session_state.query_cache_generation = generation
+
+def get_cached_result(query: str):
+    """Return the cached answer for an identical (normalized) query, if any"""
+    sync_query_caches()
+    cache = st.session_state.query_result_cache
+    key = query_cache_key(normalize_query(query))
+    if key in cache:
+        cache.move_to_end(key)
+        return cache[key]
+    return None
+
+def get_semantic_cache(dim: int) -> SemanticCache:
+    """Get the session semantic cache, creating it on first use"""
+    sync_query_caches()
+    if st.session_state.semantic_cache is None:
+        st.session_state.semantic_cache = SemanticCache(dim, max_entries=SEMANTIC_CACHE_SIZE)
+    return st.session_state.semantic_cache
+
+def cache_result(query: str, result: Dict, embedding: np.ndarray = None):
+    """Store an answer in the session LRU cache (and semantic cache)
+
+    Errors and answers without sources (the "no relevant information"
+    fallback) are not cached, nor are answers computed while another
+    session changed the knowledge base.
+    """
+    if result.get('error') or not result.get('sources'):
+        return
+    if get_knowledge_base_generation()['value'] != st.session_state.query_cache_generation:
+        return
+
+    cache = st.session_state.query_result_cache
+    cache[query_cache_key(normalize_query(query))] = result
+    if len(cache) > QUERY_CACHE_SIZE:
+        cache.popitem(last=False)
+
+    if embedding is not None:
+        get_semantic_cache(len(embedding)).put(embedding, result)
+
+def clear_query_caches():
+    """Invalidate cached answers in every session after the knowledge base changes"""
+    get_knowledge_base_generation()['value'] += 1
+    sync_query_caches()
 
 def initialize_app():
     """Initialize the RAG pipeline"""
     try:
-        config = Config()
+        config = get_config()
         config.validate_config()
-        st.session_state.rag_pipeline = RAGPipeline()
+        st.session_state.rag_pipeline = get_rag_pipeline()
         return True
     except ValueError as e:
         st.error(f"Configuration Error: {str(e)}")
@@ -50,13 +198,33 @@ def initialize_app():
         st.error(f"Initialization Error: {str(e)}")
         return False
 
+def read_text(uploaded_file) -> str:
+    """Decode an uploaded file without consuming its read pointer"""
+    return uploaded_file.getvalue().decode('utf-8', errors='replace')
+
+def content_hash(text: str) -> str:
+    """Fast content fingerprint used to memoize generated documentation"""
+    return hashlib.blake2b(text.encode('utf-8'), digest_size=16).hexdigest()
+
+@st.cache_data(max_entries=DOC_CACHE_ENTRIES)
+def generate_pro_documentation(file_hash: str, filename: str, _file_content: str) -> str:
+    """Generate documentation once per (content, filename) pair"""
+    return get_pro_doc_generator().generate_professional_documentation(_file_content, filename)
+
+def is_code_file(filename: str) -> bool:
+    """Constant-time check for code extensions; other names (e.g. .txt with
+    code-like keywords) are left to the documentation generator"""
+    if os.path.splitext(filename)[1].lower() in CODE_FILE_EXTENSIONS:
+        return True
+    return get_pro_doc_generator().is_code_file(filename)
+
 def upload_documents():
     """Handle document upload and processing"""
     st.header("📤 Upload API Documentation & Code Files")
     
     # Initialize professional documentation generator
     if st.session_state.professional_doc_generator is None:
-        st.session_state.professional_doc_generator = ProfessionalDocumentationGenerator()
+        st.session_state.professional_doc_generator = get_pro_doc_generator()
     
     uploaded_files = st.file_uploader(
         "Choose files to upload",
@@ -75,71 +243,137 @@ def upload_documents():
         
         if process_docs:
             with st.spinner("Processing documents for Q&A..."):
-                processor = DocumentProcessor()
-                vector_store = VectorStore()
+                processor = get_processor()
+                vector_store = get_vector_store()
                 
                 total_chunks = 0
-                processed_files = []
+                processed_files = [None] * len(uploaded_files)
+                all_chunks = []
+                per_file_counts = []
                 
-                for uploaded_file in uploaded_files:
-                    try:
-                        # Process document
-                        chunks = processor.process_uploaded_file(uploaded_file)
-                        
-                        # Add to vector store
-                        success = vector_store.add_documents(chunks)
-                        
-                        if success:
-                            total_chunks += len(chunks)
-                            processed_files.append({
-                                'name': uploaded_file.name,
-                                'chunks': len(chunks),
-                                'size': uploaded_file.size
-                            })
-                        else:
-                            st.error(f"Failed to process {uploaded_file.name}")
-                    
-                    except Exception as e:
-                        st.error(f"Error processing {uploaded_file.name}: {str(e)}")
+                # Phase 1: parse and chunk every file in parallel; Streamlit
+                # calls are not thread-safe, so errors are stored per file and
+                # rendered once, in upload order, after processing
+                parsed = [None] * len(uploaded_files)
+                file_errors = [None] * len(uploaded_files)
+                with ThreadPoolExecutor(max_workers=min(MAX_PARSE_WORKERS, len(uploaded_files))) as executor:
+                    futures = {
+                        executor.submit(processor.process_uploaded_file, uploaded_file): i
+                        for i, uploaded_file in enumerate(uploaded_files)
+                    }
+                    for future in as_completed(futures):
+                        i = futures[future]
+                        try:
+                            parsed[i] = future.result()
+                        except Exception as e:
+                            file_errors[i] = f"Error processing {uploaded_files[i].name}: {str(e)}"
+                
+                # Keep upload order so chunk ranges map back to files
+                for i, chunks in enumerate(parsed):
+                    if chunks is not None:
+                        per_file_counts.append((i, len(all_chunks), len(chunks)))
+                        all_chunks.extend(chunks)
+                
+                # Skip chunks whose text is already stored in the knowledge base
+                embedding_cache = get_embedding_cache()
+                model_name = embedding_cache_namespace()
+                chunk_hashes = [EmbeddingCache.hash_text(chunk['text']) for chunk in all_chunks]
+                seen = embedding_cache.get_many(model_name, list(set(chunk_hashes)))
+                is_new = [False] * len(all_chunks)
+                for i, chunk_hash in enumerate(chunk_hashes):
+                    if chunk_hash not in seen:
+                        seen.add(chunk_hash)
+                        is_new[i] = True
+                pending = [i for i, new in enumerate(is_new) if new]
+                new_chunks = [all_chunks[i] for i in pending]
+                
+                # Phase 2: embed and store all new chunks in one call; embeddings
+                # are computed locally, so there is no request token limit to split on
+                store_failed = False
+                if new_chunks:
+                    if vector_store.add_documents(new_chunks):
+                        embedding_cache.put_many(model_name, [chunk_hashes[i] for i in pending])
+                    else:
+                        store_failed = True
+                
+                total_skipped = 0
+                for i, start, count in per_file_counts:
+                    uploaded_file = uploaded_files[i]
+                    stored = sum(is_new[start:start + count])
+                    if stored and store_failed:
+                        file_errors[i] = f"Failed to process {uploaded_file.name}"
+                    else:
+                        total_chunks += stored
+                        total_skipped += count - stored
+                        processed_files[i] = {
+                            'name': uploaded_file.name,
+                            'chunks': stored,
+                            'skipped': count - stored,
+                            'size': uploaded_file.size
+                        }
+                processed_files = [file_info for file_info in processed_files if file_info is not None]
+                errors = [error for error in file_errors if error is not None]
+                
+                if errors:
+                    st.error("\n\n".join(errors))
                 
                 if processed_files:
-                    st.success(f"Successfully processed {len(processed_files)} files with {total_chunks} chunks!")
+                    skipped_note = f" ({total_skipped} already in the knowledge base)" if total_skipped else ""
+                    st.success(f"Successfully processed {len(processed_files)} files with {total_chunks} new chunks{skipped_note}!")
                     
                     # Show processing summary
                     st.subheader("Processing Summary")
+                    summary = []
                     for file_info in processed_files:
-                        st.write(f"✅ **{file_info['name']}** - {file_info['chunks']} chunks ({file_info['size']} bytes)")
+                        if file_info['skipped'] and not file_info['chunks']:
+                            summary.append(f"♻️ **{file_info['name']}** - all {file_info['skipped']} chunks already in the knowledge base ({file_info['size']} bytes)")
+                        elif file_info['skipped']:
+                            summary.append(f"✅ **{file_info['name']}** - {file_info['chunks']} chunks stored, {file_info['skipped']} already in the knowledge base ({file_info['size']} bytes)")
+                        else:
+                            summary.append(f"✅ **{file_info['name']}** - {file_info['chunks']} chunks ({file_info['size']} bytes)")
+                    st.markdown("\n\n".join(summary))
                     
                     # Update knowledge base stats
                     update_knowledge_base_stats()
+                    if total_chunks:
+                        clear_query_caches()
         
         if generate_pro_docs:
             with st.spinner("Generating documentation..."):
-                st.session_state.generated_documentation = []
+                generated = [None] * len(uploaded_files)
+                warnings: List[str] = []
+                errors: List[str] = []
                 
-                for uploaded_file in uploaded_files:
+                for i, uploaded_file in enumerate(uploaded_files):
                     try:
                         # Check if it's a code file
-                        if st.session_state.professional_doc_generator.is_code_file(uploaded_file.name):
+                        if is_code_file(uploaded_file.name):
                             # Read file content
-                            file_content = uploaded_file.read().decode('utf-8')
+                            file_content = read_text(uploaded_file)
                             
-                            # Generate professional documentation
-                            markdown_doc = st.session_state.professional_doc_generator.generate_professional_documentation(
-                                file_content, uploaded_file.name
+                            # Generate professional documentation (memoized by content)
+                            markdown_doc = generate_pro_documentation(
+                                content_hash(file_content), uploaded_file.name, file_content
                             )
                             
-                            st.session_state.generated_documentation.append({
+                            generated[i] = {
                                 'filename': uploaded_file.name,
                                 'documentation': None,
                                 'markdown': markdown_doc,
                                 'type': 'professional'
-                            })
+                            }
                         else:
-                            st.warning(f"⚠️ {uploaded_file.name} is not recognized as a code file. Supported: .py, .js, .java, .cpp, .c, .go, .rs, .php, .ts, or .txt files containing code (with keywords like 'test', 'api', 'service', etc. in filename)")
+                            warnings.append(f"⚠️ {uploaded_file.name} is not recognized as a code file. Supported: .py, .js, .java, .cpp, .c, .go, .rs, .php, .ts, or .txt files containing code (with keywords like 'test', 'api', 'service', etc. in filename)")
                     
                     except Exception as e:
-                        st.error(f"Error generating documentation for {uploaded_file.name}: {str(e)}")
+                        errors.append(f"Error generating documentation for {uploaded_file.name}: {str(e)}")
+                
+                st.session_state.generated_documentation = [doc_info for doc_info in generated if doc_info is not None]
+                
+                if warnings:
+                    st.warning("\n\n".join(warnings))
+                if errors:
+                    st.error("\n\n".join(errors))
                 
                 if st.session_state.generated_documentation:
                     st.success(f"✨ Generated documentation for {len(st.session_state.generated_documentation)} code file(s)!")
@@ -172,6 +406,17 @@ def update_knowledge_base_stats():
     if st.session_state.rag_pipeline:
         st.session_state.knowledge_base_stats = st.session_state.rag_pipeline.get_knowledge_base_stats()
 
+def knowledge_base_key() -> Tuple:
+    """Fingerprint of the shared knowledge base, read from the store itself
+    rather than this session's stats snapshot"""
+    info = get_vector_store().get_collection_info()
+    return (get_knowledge_base_generation()['value'], info.get('document_count', 0))
+
+@st.cache_data(ttl=300)
+def get_suggested_questions(kb_key: Tuple) -> List[str]:
+    """Suggested questions, recomputed only when the knowledge base changes"""
+    return get_rag_pipeline().get_suggested_questions()
+
 def show_knowledge_base_info():
     """Display knowledge base information"""
     st.header("📊 Knowledge Base Status")
@@ -201,14 +446,60 @@ def show_knowledge_base_info():
         # Clear knowledge base button
         if st.button("🗑️ Clear Knowledge Base", type="secondary"):
             if st.session_state.rag_pipeline:
-                vector_store = VectorStore()
+                vector_store = get_vector_store()
                 if vector_store.delete_collection():
+                    # Drop the store handle that may still point at the deleted
+                    # collection; the pipeline (and its LLM) is kept
+                    get_embedding_cache().clear(embedding_cache_namespace())
+                    get_vector_store.clear()
+                    st.session_state.rag_pipeline.vector_store = get_vector_store()
                     st.success("Knowledge base cleared successfully!")
                     update_knowledge_base_stats()
+                    clear_query_caches()
                     st.rerun()
                 else:
                     st.error("Failed to clear knowledge base")
 
+def confidence_color(confidence: float) -> str:
+    """Colour for a confidence score"""
+    return CONFIDENCE_COLORS[bisect.bisect_left(CONFIDENCE_THRESHOLDS, confidence)]
+
+def close_code_fences(text: str) -> str:
+    """Close a trailing unbalanced ``` fence (e.g. an answer cut off at
+    MAX_TOKENS) so it cannot swallow the rest of the history block"""
+    if len(re.findall(r'^[ \t]*```', text, re.M)) % 2:
+        return text + "\n```"
+    return text
+
+def render_chat_turn(chat: Dict) -> str:
+    """Render one question/answer pair as Markdown"""
+    lines = [
+        f"**🙋 Question:** {close_code_fences(chat['query'])}",
+        "",
+        f"**🤖 Answer:** {close_code_fences(chat['response'])}",
+        "",
+        f"**Confidence:** :{confidence_color(chat['confidence'])}[{chat['confidence']:.1%}]",
+    ]
+    if chat['sources']:
+        lines += ["", "**Sources:**"]
+        lines += [f"- {source['name']} (relevance: {source['relevance_score']:.1%})" for source in chat['sources']]
+    lines += ["", "---"]
+    return "\n".join(lines)
+
+def get_history_markdown() -> Tuple[str, str]:
+    """Recent and older chat history (newest first) as Markdown strings
+
+    History is append-only, so only turns added since the last render are
+    converted; the joined strings are kept in session state between reruns.
+    """
+    parts = st.session_state.setdefault('_history_parts', [])
+    history = st.session_state.chat_history
+    if len(parts) != len(history) or '_history_html' not in st.session_state:
+        parts.extend(render_chat_turn(chat) for chat in history[len(parts):])
+        st.session_state._history_html = "\n\n".join(reversed(parts[-HISTORY_RECENT_TURNS:]))
+        st.session_state._history_older_html = "\n\n".join(reversed(parts[:-HISTORY_RECENT_TURNS]))
+    return st.session_state._history_html, st.session_state._history_older_html
+
 def chat_interface():
     """Main chat interface"""
     st.header("💬 Ask Questions About Your API Documentation")
@@ -220,7 +511,7 @@ def chat_interface():
     
     # Suggested questions
     with st.expander("💡 Suggested Questions"):
-        suggested = st.session_state.rag_pipeline.get_suggested_questions()
+        suggested = get_suggested_questions(knowledge_base_key())
         for i, question in enumerate(suggested):
             if st.button(question, key=f"suggested_{i}"):
                 st.session_state.current_query = question
@@ -241,12 +532,25 @@ def chat_interface():
     
     if clear_chat:
         st.session_state.chat_history = []
+        st.session_state._history_parts = []
+        st.session_state._history_html = ""
+        st.session_state._history_older_html = ""
         st.rerun()
     
     if ask_button and query:
+        # Reuse the answer for a repeated or rephrased question
+        result = get_cached_result(query)
+        query_embedding = None
+        if result is None:
+            query_embedding = embed_query(query)
+            result = get_semantic_cache(len(query_embedding)).get(
+                query_embedding, threshold=SEMANTIC_CACHE_THRESHOLD
+            )
+        
         with st.spinner("Searching knowledge base and generating response..."):
-            # Process query
-            result = st.session_state.rag_pipeline.process_query(query)
+            if result is None:
+                result = st.session_state.rag_pipeline.process_query(query)
+                cache_result(query, result, query_embedding)
             
             # Add to chat history
             st.session_state.chat_history.append({
@@ -264,24 +568,13 @@ def chat_interface():
     if st.session_state.chat_history:
         st.subheader("💭 Chat History")
         
-        for i, chat in enumerate(reversed(st.session_state.chat_history)):
-            with st.container():
-                st.markdown(f"**🙋 Question:** {chat['query']}")
-                st.markdown(f"**🤖 Answer:** {chat['response']}")
-                
-                # Show confidence and sources
-                col1, col2 = st.columns(2)
-                with col1:
-                    confidence_color = "green" if chat['confidence'] > 0.7 else "orange" if chat['confidence'] > 0.4 else "red"
-                    st.markdown(f"**Confidence:** :{confidence_color}[{chat['confidence']:.1%}]")
-                
-                with col2:
-                    if chat['sources']:
-                        st.markdown("**Sources:**")
-                        for source in chat['sources']:
-                            st.markdown(f"• {source['name']} (relevance: {source['relevance_score']:.1%})")
-                
-                st.divider()
+        recent_markdown, older_markdown = get_history_markdown()
+        st.markdown(recent_markdown)
+        
+        older_turns = len(st.session_state.chat_history) - HISTORY_RECENT_TURNS
+        if older_turns > 0:
+            with st.expander(f"Older ({older_turns} turns)"):
+                st.markdown(older_markdown)
 
 def main():
     """Main application"""
@@ -305,13 +598,29 @@ def main():
         
         # Configuration info
         st.subheader("⚙️ Configuration")
-        config = Config()
+        config = get_config()
         st.write(f"**Model:** {config.CHAT_MODEL}")
         st.write(f"**Temperature:** {config.TEMPERATURE}")
         st.write(f"**Max Tokens:** {config.MAX_TOKENS}")
         
         st.divider()
         
+        # Query cache info
+        st.subheader("⚡ Query Cache")
+        # Read the encoder from the pipeline so rendering never loads a model
+        encoder = getattr(getattr(st.session_state.rag_pipeline, 'vector_store', None), 'embedding_model', None)
+        semantic_cache = st.session_state.semantic_cache
+        col1, col2 = st.columns(2)
+        with col1:
+            st.metric("Cached Answers", len(st.session_state.query_result_cache))
+        with col2:
+            if isinstance(encoder, CachedEncoder):
+                st.metric("Embedding Hits", f"{encoder.hits}/{encoder.hits + encoder.misses}")
+        if semantic_cache is not None:
+            st.metric("Semantic Hits", f"{semantic_cache.hits}/{semantic_cache.hits + semantic_cache.misses}")
+        
+        st.divider()
+        
         # Help section
         with st.expander("❓ Help"):
             st.markdown("""
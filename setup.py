@@ -5,6 +5,12 @@ import subprocess
 import sys
 import os
 
+# Base pip command: prefer wheels, never prompt, skip the self-update check
+PIP_INSTALL = [
+    sys.executable, "-m", "pip", "install",
+    "--prefer-binary", "--no-input", "--disable-pip-version-check"
+]
+
 def install_requirements():
     """Install required packages"""
     print("Installing required packages...")
@@ -15,18 +21,11 @@ def install_requirements():
         "openai",
         "python-dotenv",
         "requests",
-        "markdown"
+        "markdown",
+        "xxhash"
     ]
     
-    # Install core packages first
-    for package in core_packages:
-        try:
-            subprocess.check_call([sys.executable, "-m", "pip", "install", package])
-            print(f"✅ Successfully installed {package}")
-        except subprocess.CalledProcessError as e:
-            print(f"❌ Failed to install {package}: {e}")
-    
-    # Try to install other packages
+    # Other packages, which may fail on some platforms
     other_packages = [
         "PyPDF2",
         "python-docx",
@@ -37,9 +36,27 @@ def install_requirements():
         "pandas"
     ]
     
+    # Resolve everything in one pip run; fall back to per-package installs
+    all_packages = core_packages + other_packages
+    try:
+        subprocess.check_call(PIP_INSTALL + all_packages)
+        print(f"✅ Successfully installed {len(all_packages)} packages")
+        return
+    except subprocess.CalledProcessError as e:
+        print(f"⚠️ Batch install failed ({e}), installing packages one by one...")
+    
+    # Install core packages first
+    for package in core_packages:
+        try:
+            subprocess.check_call(PIP_INSTALL + [package])
+            print(f"✅ Successfully installed {package}")
+        except subprocess.CalledProcessError as e:
+            print(f"❌ Failed to install {package}: {e}")
+    
+    # Try to install other packages
     for package in other_packages:
         try:
-            subprocess.check_call([sys.executable, "-m", "pip", "install", package])
+            subprocess.check_call(PIP_INSTALL + [package])
             print(f"✅ Successfully installed {package}")
         except subprocess.CalledProcessError as e:
             print(f"⚠️ Warning: Failed to install {package}: {e}")
@@ -0,0 +1,3 @@
+"""
+Core modules of the API Documentation RAG Assistant
+"""
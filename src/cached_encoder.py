@@ -0,0 +1,61 @@
+"""
+LRU cache in front of a sentence-transformers model for single-text encodes
+"""
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+
+class CachedEncoder:
+    """Wrap an embedding model so repeated single-text encodes are free
+
+    Only calls that encode one text are cached (query embeddings); batch
+    encodes of document chunks go straight to the model. Any other
+    attribute is delegated to the wrapped model.
+    """
+
+    def __init__(self, model, maxsize: int = 512):
+        self.model = model
+        self.maxsize = maxsize
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def encode(self, sentences, **kwargs):
+        """Same contract as SentenceTransformer.encode"""
+        single = isinstance(sentences, str)
+        if not single and (not isinstance(sentences, (list, tuple)) or len(sentences) != 1):
+            return self.model.encode(sentences, **kwargs)
+
+        text = sentences if single else sentences[0]
+        key = (text, tuple(sorted(kwargs.items())))
+        try:
+            hash(key)
+        except TypeError:
+            return self.model.encode(sentences, **kwargs)
+
+        with self._lock:
+            embedding = self._cache.get(key)
+            if embedding is not None:
+                self._cache.move_to_end(key)
+                self.hits += 1
+
+        if embedding is None:
+            embedding = np.asarray(self.model.encode([text], **kwargs)[0])
+            with self._lock:
+                self.misses += 1
+                self._cache[key] = embedding
+                if len(self._cache) > self.maxsize:
+                    self._cache.popitem(last=False)
+
+        return embedding.copy() if single else embedding[np.newaxis, :].copy()
+
+    def __len__(self) -> int:
+        return len(self._cache)
+
+    def __getattr__(self, name):
+        if name == 'model':
+            raise AttributeError(name)
+        return getattr(self.model, name)
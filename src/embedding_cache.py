@@ -0,0 +1,74 @@
+"""
+Persistent SQLite record of chunk texts already stored, keyed by content hash
+"""
+import os
+import re
+import sqlite3
+import threading
+from typing import Iterable, List, Set
+
+import xxhash
+
+
+class EmbeddingCache:
+    """Remember which chunk texts are already in the vector store, per namespace
+
+    Chunks are keyed by an xxh3-128 digest of their normalized text.
+    """
+
+    # Stay under SQLite's default host-parameter limit in bulk lookups
+    _MAX_PARAMS = 900
+
+    def __init__(self, db_path: str):
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS embeddings (
+                content_hash TEXT NOT NULL,
+                model TEXT NOT NULL,
+                PRIMARY KEY (model, content_hash)
+            )"""
+        )
+        self._conn.commit()
+
+    @staticmethod
+    def hash_text(text: str) -> str:
+        """Hash chunk text after collapsing whitespace"""
+        normalized = re.sub(r'\s+', ' ', text).strip().encode('utf-8')
+        return xxhash.xxh3_128_hexdigest(normalized)
+
+    def get_many(self, model: str, hashes: List[str]) -> Set[str]:
+        """Return the hashes already recorded for model"""
+        found = set()
+        with self._lock:
+            for start in range(0, len(hashes), self._MAX_PARAMS):
+                batch = hashes[start:start + self._MAX_PARAMS]
+                placeholders = ",".join("?" * len(batch))
+                rows = self._conn.execute(
+                    f"SELECT content_hash FROM embeddings WHERE model = ? AND content_hash IN ({placeholders})",
+                    [model, *batch]
+                )
+                found.update(content_hash for content_hash, in rows)
+        return found
+
+    def put_many(self, model: str, hashes: Iterable[str]):
+        """Record hashes as stored for model"""
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO embeddings (content_hash, model) VALUES (?, ?)",
+                [(content_hash, model) for content_hash in hashes]
+            )
+            self._conn.commit()
+
+    def clear(self, model: str = None):
+        """Remove recorded hashes for one model, or for all models"""
+        with self._lock:
+            if model is None:
+                self._conn.execute("DELETE FROM embeddings")
+            else:
+                self._conn.execute("DELETE FROM embeddings WHERE model = ?", (model,))
+            self._conn.commit()
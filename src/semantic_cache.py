@@ -0,0 +1,113 @@
+"""
+Semantic cache for answered questions using random-projection LSH
+"""
+from collections import deque
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+
+class SemanticCache:
+    """Cache RAG results by query embedding so rephrased questions hit
+
+    Embeddings are stored as int8 with a per-vector scale (symmetric
+    quantization), a quarter of the float32 footprint; cosine scores lose
+    well under 1% precision.
+    """
+
+    def __init__(self, dim: int, n_tables: int = 8, n_bits: int = 16,
+                 max_entries: int = 1024, seed: int = 0):
+        self.dim = dim
+        self.n_tables = n_tables
+        self.n_bits = n_bits
+        self.max_entries = max_entries
+
+        rng = np.random.default_rng(seed)
+        # One Gaussian projection matrix per hash table
+        self.projections = rng.standard_normal((n_tables, n_bits, dim)).astype(np.float32)
+        self.tables: List[Dict[Tuple[int, ...], List[int]]] = [{} for _ in range(n_tables)]
+
+        self.entries: Dict[int, Tuple[np.ndarray, float, List[Tuple[int, ...]], Dict]] = {}
+        self.order = deque()
+        self._next_id = 0
+        self.hits = 0
+        self.misses = 0
+
+    def _signatures(self, embedding: np.ndarray) -> List[Tuple[int, ...]]:
+        """Compute the bucket key of an embedding in every table"""
+        bits = (self.projections @ embedding) > 0
+        return [tuple(row.astype(int)) for row in bits]
+
+    @staticmethod
+    def _normalize(embedding: np.ndarray) -> np.ndarray:
+        embedding = np.asarray(embedding, dtype=np.float32)
+        norm = np.linalg.norm(embedding)
+        return embedding / norm if norm > 0 else embedding
+
+    @staticmethod
+    def _quantize(embedding: np.ndarray) -> Tuple[np.ndarray, float]:
+        """Symmetric int8 quantization: embedding ~= quantized * scale"""
+        scale = float(np.max(np.abs(embedding))) / 127 or 1.0
+        quantized = np.clip(np.rint(embedding / scale), -127, 127).astype(np.int8)
+        return quantized, scale
+
+    def get(self, embedding: np.ndarray, threshold: float = 0.92) -> Optional[Dict]:
+        """Return the cached result of the most similar query above threshold"""
+        query = self._normalize(embedding)
+
+        candidates = set()
+        for table, signature in zip(self.tables, self._signatures(query)):
+            candidates.update(table.get(signature, ()))
+
+        best_result = None
+        if candidates:
+            ids = list(candidates)
+            matrix = np.stack([self.entries[i][0] for i in ids])
+            scales = np.array([self.entries[i][1] for i in ids], dtype=np.float32)
+            # Dequantize in one matmul across all candidates
+            scores = (matrix.astype(np.float32) @ query) * scales
+            best = int(np.argmax(scores))
+            if scores[best] >= threshold:
+                best_result = self.entries[ids[best]][3]
+
+        if best_result is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return best_result
+
+    def put(self, embedding: np.ndarray, result: Dict):
+        """Add a query embedding and its result, evicting the oldest entry"""
+        embedding = self._normalize(embedding)
+
+        signatures = self._signatures(embedding)
+        quantized, scale = self._quantize(embedding)
+
+        entry_id = self._next_id
+        self._next_id += 1
+        self.entries[entry_id] = (quantized, scale, signatures, result)
+        self.order.append(entry_id)
+        for table, signature in zip(self.tables, signatures):
+            table.setdefault(signature, []).append(entry_id)
+
+        if len(self.order) > self.max_entries:
+            self._evict(self.order.popleft())
+
+    def _evict(self, entry_id: int):
+        _, _, signatures, _ = self.entries.pop(entry_id)
+        for table, signature in zip(self.tables, signatures):
+            bucket = table.get(signature)
+            if bucket is None:
+                continue
+            bucket.remove(entry_id)
+            if not bucket:
+                del table[signature]
+
+    def clear(self):
+        """Remove all cached entries"""
+        self.tables = [{} for _ in range(self.n_tables)]
+        self.entries.clear()
+        self.order.clear()
+
+    def __len__(self) -> int:
+        return len(self.entries)
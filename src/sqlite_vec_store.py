@@ -0,0 +1,235 @@
+"""
+Vector store backed by the sqlite-vec extension for larger knowledge bases
+"""
+import json
+import os
+import queue
+import sqlite3
+import threading
+from typing import Dict, List
+
+import numpy as np
+
+from src.config import Config
+from src.vector_store import VectorStore
+
+
+class SqliteVecStore(VectorStore):
+    """VectorStore that keeps embeddings in a sqlite-vec ``vec0`` table
+
+    Chunk text and metadata live in a regular table sharing the rowid of
+    the embedding, so a KNN query and its metadata lookup hit one file.
+    The Chroma client of the parent class is never opened.
+    """
+
+    # Chunks embedded per step of the add_documents pipeline
+    EMBED_BATCH_SIZE = 16
+
+    def __init__(self, db_path: str = None):
+        # Raises ImportError / sqlite3.OperationalError when the extension is unavailable
+        import sqlite_vec
+        from sentence_transformers import SentenceTransformer
+
+        config = Config()
+        self.db_path = db_path or os.path.join(config.CHROMA_PERSIST_DIRECTORY, 'sqlite_vec.db')
+        directory = os.path.dirname(self.db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._lock = threading.Lock()
+        # Held for a whole write transaction; the store (and its connection)
+        # is shared by every session
+        self._write_lock = threading.Lock()
+        self.conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self.conn.enable_load_extension(True)
+        sqlite_vec.load(self.conn)
+        self.conn.enable_load_extension(False)
+
+        self.embedding_model = SentenceTransformer(config.EMBEDDING_MODEL)
+        self.dim = self.embedding_model.get_sentence_embedding_dimension()
+        self._create_tables()
+
+    def _create_tables(self):
+        with self._lock:
+            self.conn.execute(
+                f"CREATE VIRTUAL TABLE IF NOT EXISTS vec_chunks USING vec0(embedding FLOAT[{self.dim}])"
+            )
+            self.conn.execute(
+                """CREATE TABLE IF NOT EXISTS chunks (
+                    rowid INTEGER PRIMARY KEY,
+                    text TEXT NOT NULL,
+                    source TEXT,
+                    metadata TEXT
+                )"""
+            )
+            self.conn.commit()
+
+    def _embed(self, texts: List[str]) -> np.ndarray:
+        # Plain encode() call (normalized here) so a CachedEncoder wrapping
+        # the model can serve query embeddings computed by the app
+        embeddings = np.asarray(self.embedding_model.encode(texts), dtype=np.float32)
+        norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+        return embeddings / np.where(norms > 0, norms, 1)
+
+    def add_documents(self, chunks: List[Dict]) -> bool:
+        """Embed chunks and insert them in one transaction
+
+        A producer thread embeds sub-batches one step ahead of the inserts,
+        so model inference overlaps with SQLite writes. Concurrent calls are
+        serialized so one caller's rollback never discards another's rows.
+        """
+        if not chunks:
+            return True
+
+        with self._write_lock:
+            return self._add_documents(chunks)
+
+    def _add_documents(self, chunks: List[Dict]) -> bool:
+        batches = [
+            chunks[i:i + self.EMBED_BATCH_SIZE]
+            for i in range(0, len(chunks), self.EMBED_BATCH_SIZE)
+        ]
+        embedded = queue.Queue(maxsize=2)
+        stop = threading.Event()
+
+        def produce():
+            try:
+                for batch in batches:
+                    if stop.is_set():
+                        return
+                    embedded.put((batch, self._embed([chunk['text'] for chunk in batch])))
+            except Exception as e:
+                embedded.put(e)
+                return
+            embedded.put(None)
+
+        producer = threading.Thread(target=produce, name="sqlite-vec-embedder", daemon=True)
+        producer.start()
+
+        try:
+            while True:
+                item = embedded.get()
+                if item is None:
+                    break
+                if isinstance(item, Exception):
+                    raise item
+                self._insert_batch(*item)
+
+            with self._lock:
+                self.conn.commit()
+            return True
+
+        except Exception as e:
+            with self._lock:
+                self.conn.rollback()
+            print(f"❌ Error adding documents: {str(e)}")
+            return False
+
+        finally:
+            # Unblock the producer if it is waiting on a full queue
+            stop.set()
+            while producer.is_alive():
+                try:
+                    embedded.get(timeout=0.1)
+                except queue.Empty:
+                    pass
+
+    def _insert_batch(self, batch: List[Dict], embeddings: np.ndarray):
+        with self._lock:
+            cursor = self.conn.cursor()
+            start = cursor.execute("SELECT COALESCE(MAX(rowid), 0) FROM chunks").fetchone()[0] + 1
+            rowids = range(start, start + len(batch))
+
+            cursor.executemany(
+                "INSERT INTO chunks (rowid, text, source, metadata) VALUES (?, ?, ?, ?)",
+                [
+                    (
+                        rowid,
+                        chunk['text'],
+                        chunk.get('source'),
+                        json.dumps({k: v for k, v in chunk.items() if k != 'text'})
+                    )
+                    for rowid, chunk in zip(rowids, batch)
+                ]
+            )
+            cursor.executemany(
+                "INSERT INTO vec_chunks (rowid, embedding) VALUES (?, ?)",
+                [(rowid, embedding.tobytes()) for rowid, embedding in zip(rowids, embeddings)]
+            )
+
+    def similarity_search(self, query: str, n_results: int = 5) -> List[Dict]:
+        """Return the n_results chunks nearest to the query"""
+        try:
+            query_embedding = self._embed([query])[0]
+            with self._lock:
+                rows = self.conn.execute(
+                    """SELECT c.text, c.metadata, v.distance
+                    FROM (
+                        SELECT rowid, distance FROM vec_chunks
+                        WHERE embedding MATCH ? AND k = ?
+                        ORDER BY distance
+                    ) AS v
+                    JOIN chunks AS c ON c.rowid = v.rowid
+                    ORDER BY v.distance""",
+                    (query_embedding.tobytes(), n_results)
+                ).fetchall()
+
+            # Embeddings are unit length, so L2 distance maps to cosine similarity
+            return [
+                {
+                    'text': text,
+                    'metadata': json.loads(metadata) if metadata else {},
+                    'similarity_score': 1 - (distance ** 2) / 2
+                }
+                for text, metadata, distance in rows
+            ]
+
+        except Exception as e:
+            print(f"❌ Error searching documents: {str(e)}")
+            return []
+
+    search_similar_documents = similarity_search
+
+    def get_collection_info(self) -> Dict:
+        """Return document count and status"""
+        try:
+            with self._lock:
+                count = self.conn.execute("SELECT COUNT(*) FROM chunks").fetchone()[0]
+            return {
+                'document_count': count,
+                'status': 'active' if count > 0 else 'empty'
+            }
+        except Exception as e:
+            return {
+                'document_count': 0,
+                'status': 'error',
+                'error': str(e)
+            }
+
+    def delete_collection(self) -> bool:
+        """Remove every stored chunk"""
+        try:
+            with self._write_lock:
+                with self._lock:
+                    self.conn.execute("DROP TABLE IF EXISTS vec_chunks")
+                    self.conn.execute("DROP TABLE IF EXISTS chunks")
+                    self.conn.commit()
+                self._create_tables()
+            return True
+        except Exception as e:
+            print(f"❌ Error deleting collection: {str(e)}")
+            return False
+
+
+def create_vector_store() -> VectorStore:
+    """Build the configured vector store backend
+
+    ``VECTOR_BACKEND=sqlite-vec`` selects SqliteVecStore; if the extension
+    cannot be loaded the default Chroma-backed VectorStore is used.
+    """
+    if os.getenv('VECTOR_BACKEND', 'chroma').lower() == 'sqlite-vec':
+        try:
+            return SqliteVecStore()
+        except (ImportError, AttributeError, sqlite3.OperationalError) as e:
+            print(f"⚠️ sqlite-vec unavailable ({str(e)}), falling back to ChromaDB")
+    return VectorStore()